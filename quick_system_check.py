@@ -4,13 +4,8 @@ Quick System Check - Verify critical components are working
 """
 
 import asyncio
-import sys
-import os
 from datetime import datetime
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 async def check_database():
     """Check if async database is working"""
     try:
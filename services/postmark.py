@@ -3,8 +3,12 @@ import requests
 import os
 from typing import Dict, List, Optional, Tuple
 import json
+import re
 from datetime import datetime
 
+# {{key}} personalization placeholder
+_PLACEHOLDER_RE = re.compile(r'\{\{([^{}]+)\}\}')
+
 class PostmarkService:
     def __init__(self):
         self.api_key = os.getenv('POSTMARK_API_KEY')
@@ -180,11 +184,14 @@ class PostmarkService:
     
     def _personalize_content(self, template: str, data: Dict) -> str:
         """Personalize email content with subscriber data"""
-        content = template
-        for key, value in data.items():
-            placeholder = f"{{{{{key}}}}}"
-            content = content.replace(placeholder, str(value or ''))
-        return content
+        # One pass over the template; placeholders without data are left as-is
+        def substitute(match):
+            key = match.group(1)
+            if key not in data:
+                return match.group(0)
+            return str(data[key] or '')
+        
+        return _PLACEHOLDER_RE.sub(substitute, template)
     
     def get_server_info(self) -> Dict:
         """Get server information and limits"""
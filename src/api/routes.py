@@ -248,8 +248,6 @@ async def list_subscribers(
         query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
-        subscribers = await db.execute_query(query, tuple(params))
-        
         # Get total count
         count_query = "SELECT COUNT(*) as total FROM subscribers WHERE status = 'active'"
         count_params = []
@@ -258,7 +256,11 @@ async def list_subscribers(
             count_query += " AND segment = ?"
             count_params.append(segment)
         
-        count_result = await db.execute_query(count_query, tuple(count_params))
+        # Page and count are independent; run them on separate pooled connections
+        subscribers, count_result = await asyncio.gather(
+            db.execute_query(query, tuple(params)),
+            db.execute_query(count_query, tuple(count_params))
+        )
         total = count_result[0]['total'] if count_result else 0
         
         return {
@@ -396,9 +398,10 @@ async def get_realtime_metrics(
 ):
     """Get real-time performance metrics from actual delivery data"""
     try:
-        # Real delivery rate from webhook events
+        # Real delivery counts from webhook events, per ESP in a single pass
         delivery_query = """
             SELECT
+                esp_provider,
                 COUNT(CASE WHEN event_type = 'delivered' THEN 1 END) as delivered,
                 COUNT(CASE WHEN event_type IN ('sent', 'delivered', 'bounce') THEN 1 END) as total_sent,
                 COUNT(CASE WHEN event_type = 'bounce' THEN 1 END) as bounced,
@@ -406,13 +409,19 @@ async def get_realtime_metrics(
                 COUNT(CASE WHEN event_type = 'click' THEN 1 END) as clicked,
                 COUNT(CASE WHEN event_type = 'complaint' THEN 1 END) as complained
             FROM delivery_events
-            WHERE timestamp > datetime('now', '-{} hours')
-        """.format(hours)
+            WHERE timestamp > datetime('now', ?)
+            GROUP BY esp_provider
+        """
+
+        esp_stats = await db.execute_query(delivery_query, (f'-{int(hours)} hours',))
 
-        delivery_stats = await db.execute_query(delivery_query)
+        # Overall totals are the sum of the per-ESP rows
+        stats = {'delivered': 0, 'total_sent': 0, 'bounced': 0, 'opened': 0, 'clicked': 0, 'complained': 0}
+        for esp_stat in esp_stats:
+            for key in stats:
+                stats[key] += esp_stat[key]
 
-        if delivery_stats and delivery_stats[0]['total_sent'] > 0:
-            stats = delivery_stats[0]
+        if stats['total_sent'] > 0:
             delivery_rate = (stats['delivered'] / stats['total_sent']) * 100
             bounce_rate = (stats['bounced'] / stats['total_sent']) * 100
             open_rate = (stats['opened'] / stats['delivered']) * 100 if stats['delivered'] > 0 else 0
@@ -420,26 +429,13 @@ async def get_realtime_metrics(
             complaint_rate = (stats['complained'] / stats['total_sent']) * 100
         else:
             delivery_rate = bounce_rate = open_rate = click_rate = complaint_rate = 0
-            stats = {'delivered': 0, 'total_sent': 0, 'bounced': 0, 'opened': 0, 'clicked': 0, 'complained': 0}
 
         # ESP breakdown
-        esp_query = """
-            SELECT
-                esp_provider,
-                COUNT(CASE WHEN event_type = 'delivered' THEN 1 END) as delivered,
-                COUNT(CASE WHEN event_type IN ('sent', 'delivered', 'bounce') THEN 1 END) as sent,
-                COUNT(CASE WHEN event_type = 'bounce' THEN 1 END) as bounced
-            FROM delivery_events
-            WHERE timestamp > datetime('now', '-{} hours')
-            GROUP BY esp_provider
-        """.format(hours)
-
-        esp_stats = await db.execute_query(esp_query)
         esp_breakdown = {}
 
         for esp_stat in esp_stats:
             provider = esp_stat['esp_provider']
-            sent = esp_stat['sent']
+            sent = esp_stat['total_sent']
             delivered = esp_stat['delivered']
             bounced = esp_stat['bounced']
 
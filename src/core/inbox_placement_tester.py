@@ -1,9 +1,11 @@
 import asyncio
 import imaplib
-import email
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 import json
+import re
+from functools import lru_cache
+import orjson
 from dataclasses import dataclass
 from email_validator import validate_email
 import dns.resolver
@@ -11,6 +13,21 @@ import hashlib
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.parser import BytesHeaderParser
+
+# Numeric value of a provider spam-score header
+_SPAM_SCORE_RE = re.compile(r'[-+]?\d*\.?\d+')
+
+# Parses only the header block, stopping at the blank line before any body
+_HEADER_PARSER = BytesHeaderParser()
+
+SEED_ACCOUNTS_CONFIG = 'config/seed_accounts.json'
+
+@lru_cache(maxsize=None)
+def load_seed_accounts_config(path: str = SEED_ACCOUNTS_CONFIG) -> Dict:
+    """Parse the seed account config once per process (restart to pick up edits)"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
 
 @dataclass
 class SeedAccount:
@@ -31,6 +48,31 @@ class PlacementResult:
     spam_score: float = 0.0
 
 class InboxPlacementTester:
+    # IMAP folders to check per provider, as (folder name, placement) pairs
+    _FOLDER_MAPPINGS = {
+        'gmail': (
+            ('INBOX', 'inbox'),
+            ('[Gmail]/Spam', 'spam'),
+            ('[Gmail]/Promotions', 'promotions'),
+            ('[Gmail]/All Mail', 'inbox')  # Fallback
+        ),
+        'outlook': (
+            ('INBOX', 'inbox'),
+            ('Junk Email', 'spam'),
+            ('Deleted Items', 'spam')
+        ),
+        'yahoo': (
+            ('INBOX', 'inbox'),
+            ('Bulk Mail', 'spam'),
+            ('Spam', 'spam')
+        ),
+        'aol': (
+            ('INBOX', 'inbox'),
+            ('Spam', 'spam')
+        )
+    }
+    _DEFAULT_FOLDERS = (('INBOX', 'inbox'),)
+    
     def __init__(self, db_session):
         self.db = db_session
         self.seed_accounts = self._load_seed_accounts()
@@ -39,8 +81,7 @@ class InboxPlacementTester:
     def _load_seed_accounts(self) -> List[SeedAccount]:
         """Load seed accounts from config"""
         try:
-            with open('config/seed_accounts.json', 'r') as f:
-                accounts_data = json.load(f)
+            accounts_data = load_seed_accounts_config()
             
             accounts = []
             for acc in accounts_data['accounts']:
@@ -263,7 +304,7 @@ class InboxPlacementTester:
 
             # Close IMAP connection
             try:
-                imap.logout()
+                await asyncio.to_thread(imap.logout)
             except:
                 pass  # Ignore logout errors
 
@@ -284,11 +325,12 @@ class InboxPlacementTester:
     async def _connect_imap(self, seed: SeedAccount) -> imaplib.IMAP4_SSL:
         """Connect to IMAP server for seed account"""
         try:
-            # Create IMAP connection
-            imap = imaplib.IMAP4_SSL(seed.imap_server, seed.imap_port)
+            # imaplib blocks, so the TLS handshake and login run in a worker
+            # thread; that lets _check_all_placements overlap all seed accounts
+            imap = await asyncio.to_thread(imaplib.IMAP4_SSL, seed.imap_server, seed.imap_port)
 
             # Login
-            imap.login(seed.email, seed.password)
+            await asyncio.to_thread(imap.login, seed.email, seed.password)
 
             print(f"✅ Connected to IMAP for {seed.email}")
             return imap
@@ -299,6 +341,12 @@ class InboxPlacementTester:
 
     async def _search_email_in_folders(self, imap, seed: SeedAccount, subject: str) -> tuple:
         """Search for test email in different folders"""
+        # One connection has one selected folder, so folders are searched in
+        # order on a worker thread while other seed accounts proceed
+        return await asyncio.to_thread(self._search_folders_blocking, imap, seed, subject)
+
+    def _search_folders_blocking(self, imap, seed: SeedAccount, subject: str) -> tuple:
+        """Search the provider's folders for the test email (blocking IMAP calls)"""
         # Define folders to check based on provider
         folders_to_check = self._get_folders_for_provider(seed.provider)
 
@@ -333,37 +381,14 @@ class InboxPlacementTester:
         # Email not found in any folder
         return 'not_found', {}, '', 0.0
 
-    def _get_folders_for_provider(self, provider: str) -> List[tuple]:
+    def _get_folders_for_provider(self, provider: str) -> Tuple[Tuple[str, str], ...]:
         """Get list of folders to check for each provider"""
-        folder_mappings = {
-            'gmail': [
-                ('INBOX', 'inbox'),
-                ('[Gmail]/Spam', 'spam'),
-                ('[Gmail]/Promotions', 'promotions'),
-                ('[Gmail]/All Mail', 'inbox')  # Fallback
-            ],
-            'outlook': [
-                ('INBOX', 'inbox'),
-                ('Junk Email', 'spam'),
-                ('Deleted Items', 'spam')
-            ],
-            'yahoo': [
-                ('INBOX', 'inbox'),
-                ('Bulk Mail', 'spam'),
-                ('Spam', 'spam')
-            ],
-            'aol': [
-                ('INBOX', 'inbox'),
-                ('Spam', 'spam')
-            ]
-        }
-
-        return folder_mappings.get(provider, [('INBOX', 'inbox')])
+        return self._FOLDER_MAPPINGS.get(provider, self._DEFAULT_FOLDERS)
 
     def _parse_email_headers(self, raw_headers: bytes) -> tuple:
         """Parse email headers to extract authentication results and spam score"""
         try:
-            msg = email.message_from_bytes(raw_headers)
+            msg = _HEADER_PARSER.parsebytes(raw_headers)
 
             # Extract authentication results
             auth_results = msg.get('Authentication-Results', '')
@@ -379,8 +404,7 @@ class InboxPlacementTester:
                 score_header = msg.get(header, '')
                 if score_header:
                     # Try to extract numeric score
-                    import re
-                    score_match = re.search(r'[-+]?\d*\.?\d+', score_header)
+                    score_match = _SPAM_SCORE_RE.search(score_header)
                     if score_match:
                         spam_score = float(score_match.group())
                         break
@@ -247,18 +247,7 @@ class EngagementTracker:
             row = cursor.fetchone()
             
             if row:
-                stats = dict(row)
-                total = stats['total_sent'] or 1  # Avoid division by zero
-                
-                # Calculate rates
-                stats['delivery_rate'] = (stats['delivered'] / total) * 100
-                stats['open_rate'] = (stats['opened'] / total) * 100
-                stats['click_rate'] = (stats['clicked'] / total) * 100
-                stats['bounce_rate'] = (stats['bounced'] / total) * 100
-                stats['complaint_rate'] = (stats['complained'] / total) * 100
-                stats['unsubscribe_rate'] = (stats['unsubscribed'] / total) * 100
-                
-                return stats
+                return self._with_rates(dict(row))
             
             return {}
             
@@ -266,6 +255,53 @@ class EngagementTracker:
             logger.error(f"Error getting campaign stats for {campaign_id}: {str(e)}")
             return {}
     
+    def get_campaigns_stats(self, campaign_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get engagement statistics for many campaigns with one grouped query"""
+        if not campaign_ids:
+            return {}
+        
+        try:
+            placeholders = ', '.join('?' * len(campaign_ids))
+            query = f'''
+                SELECT 
+                    campaign_id,
+                    COUNT(*) as total_sent,
+                    SUM(CASE WHEN delivered_time IS NOT NULL THEN 1 ELSE 0 END) as delivered,
+                    SUM(CASE WHEN opened_time IS NOT NULL THEN 1 ELSE 0 END) as opened,
+                    SUM(CASE WHEN clicked_time IS NOT NULL THEN 1 ELSE 0 END) as clicked,
+                    SUM(CASE WHEN bounced_time IS NOT NULL THEN 1 ELSE 0 END) as bounced,
+                    SUM(CASE WHEN complained_time IS NOT NULL THEN 1 ELSE 0 END) as complained,
+                    SUM(CASE WHEN unsubscribed_time IS NOT NULL THEN 1 ELSE 0 END) as unsubscribed
+                FROM email_sends 
+                WHERE campaign_id IN ({placeholders})
+                GROUP BY campaign_id
+            '''
+            
+            cursor = self.db.execute(query, tuple(campaign_ids))
+            
+            return {
+                row['campaign_id']: self._with_rates(dict(row))
+                for row in cursor.fetchall()
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting campaign stats for {campaign_ids}: {str(e)}")
+            return {}
+    
+    @staticmethod
+    def _with_rates(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Add percentage rates to a row of campaign counts"""
+        total = stats['total_sent'] or 1  # Avoid division by zero
+        
+        stats['delivery_rate'] = (stats['delivered'] / total) * 100
+        stats['open_rate'] = (stats['opened'] / total) * 100
+        stats['click_rate'] = (stats['clicked'] / total) * 100
+        stats['bounce_rate'] = (stats['bounced'] / total) * 100
+        stats['complaint_rate'] = (stats['complained'] / total) * 100
+        stats['unsubscribe_rate'] = (stats['unsubscribed'] / total) * 100
+        
+        return stats
+    
     def get_subscriber_engagement_history(self, email: str, days: int = 30) -> List[Dict[str, Any]]:
         """Get engagement history for a subscriber"""
         try:
@@ -273,11 +309,11 @@ class EngagementTracker:
                 SELECT es.*, ee.event_type, ee.event_time, ee.clicked_url
                 FROM email_sends es
                 LEFT JOIN engagement_events ee ON es.id = ee.email_send_id
-                WHERE es.email = ? AND es.sent_time >= datetime('now', '-{} days')
+                WHERE es.email = ? AND es.sent_time >= datetime('now', ?)
                 ORDER BY es.sent_time DESC, ee.event_time DESC
-            '''.format(days)
+            '''
             
-            cursor = self.db.execute(query, (email,))
+            cursor = self.db.execute(query, (email, f'-{int(days)} days'))
             rows = cursor.fetchall()
             
             return [dict(row) for row in rows]
@@ -9,10 +9,32 @@ logger = logging.getLogger(__name__)
 
 DATABASE_URL = "email_system.db"
 
+# Per-connection tuning: WAL journal, 64MB page cache, 256MB mmap
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY"
+)
+
+def configure_connection(conn: sqlite3.Connection) -> None:
+    """Apply performance pragmas to a new connection
+    
+    Each pragma is applied on its own, so one that cannot take effect
+    (journal_mode inside an open transaction, say) does not skip the rest.
+    """
+    for pragma in _PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not apply {pragma}: {str(e)}")
+
 def get_db() -> Generator[sqlite3.Connection, None, None]:
     """Get database connection (legacy sync version)"""
     conn = sqlite3.connect(DATABASE_URL)
     conn.row_factory = sqlite3.Row
+    configure_connection(conn)
     try:
         yield conn
     finally:
@@ -46,7 +68,57 @@ def create_tables():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_subscribers_status_created ON subscribers(status, created_at, id)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_subscribers_status_segment_created ON subscribers(status, segment, created_at, id)')
         
+        # Active subscriber counts per segment, kept current by triggers
+        counts_exist = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'subscriber_counts'"
+        ).fetchone()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS subscriber_counts (
+                segment TEXT PRIMARY KEY NOT NULL,
+                n INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        if not counts_exist:
+            # Seed from existing rows once, when the counter table is first added
+            conn.execute('''
+                INSERT INTO subscriber_counts (segment, n)
+                SELECT IFNULL(segment, ''), COUNT(*) FROM subscribers
+                WHERE status = 'active' GROUP BY IFNULL(segment, '')
+            ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_subscriber_counts_insert
+            AFTER INSERT ON subscribers WHEN NEW.status = 'active'
+            BEGIN
+                INSERT OR IGNORE INTO subscriber_counts (segment, n) VALUES (IFNULL(NEW.segment, ''), 0);
+                UPDATE subscriber_counts SET n = n + 1 WHERE segment = IFNULL(NEW.segment, '');
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_subscriber_counts_delete
+            AFTER DELETE ON subscribers WHEN OLD.status = 'active'
+            BEGIN
+                UPDATE subscriber_counts SET n = n - 1 WHERE segment = IFNULL(OLD.segment, '');
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_subscriber_counts_update_old
+            AFTER UPDATE OF status, segment ON subscribers WHEN OLD.status = 'active'
+            BEGIN
+                UPDATE subscriber_counts SET n = n - 1 WHERE segment = IFNULL(OLD.segment, '');
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_subscriber_counts_update_new
+            AFTER UPDATE OF status, segment ON subscribers WHEN NEW.status = 'active'
+            BEGIN
+                INSERT OR IGNORE INTO subscriber_counts (segment, n) VALUES (IFNULL(NEW.segment, ''), 0);
+                UPDATE subscriber_counts SET n = n + 1 WHERE segment = IFNULL(NEW.segment, '');
+            END
+        ''')
+
         # Campaigns table
         conn.execute('''
             CREATE TABLE IF NOT EXISTS campaigns (
@@ -100,6 +172,12 @@ def create_tables():
                 FOREIGN KEY (subscriber_id) REFERENCES subscribers (id)
             )
         ''')
+        # Covering index: campaign stats are answered from the index alone
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_email_sends_campaign_cover
+            ON email_sends(campaign_id, sent_time, delivered_time, opened_time,
+                           clicked_time, bounced_time, complained_time, unsubscribed_time)
+        ''')
         
         conn.commit()
         logger.info("Database tables created successfully")
@@ -1,19 +1,44 @@
 # src/database/subscriber_manager.py
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import sqlite3
+from typing import Dict, List, Optional, Any, Tuple, Sequence
 from datetime import datetime
-import json
+from functools import lru_cache
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _encode_json(value: Any) -> Optional[str]:
+    """Serialize a JSON column value, storing empty values as NULL"""
+    # Non-str keys (e.g. custom_fields={1: 'x'}) are stringified, as json.dumps does
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode() if value else None
+
+@lru_cache(maxsize=1024)
+def _encode_tag_tuple(tags: Tuple[str, ...]) -> str:
+    return orjson.dumps(tags).decode()
+
+def _encode_tags(tags: Optional[List[str]]) -> Optional[str]:
+    """Serialize tags, reusing the encoding for tag lists seen before"""
+    return _encode_tag_tuple(tuple(tags)) if tags else None
+
 class SubscriberManager:
     """
     Manages subscriber operations (legacy sync version)
     For async operations, use AsyncDatabaseManager directly
     """
     
+    # Columns update_subscriber may change, mapped to how each value is stored
+    _UPDATE_ENCODERS = {
+        'name': lambda value: value,
+        'company': lambda value: value,
+        'segment': lambda value: value,
+        'source': lambda value: value,
+        'custom_fields': _encode_json,
+        'tags': _encode_tags
+    }
+    
     def __init__(self, db_session):
         self.db = db_session
     
@@ -22,25 +47,27 @@ class SubscriberManager:
                       custom_fields: Optional[Dict] = None, tags: Optional[List[str]] = None) -> Tuple[bool, str]:
         """Add a new subscriber"""
         try:
-            # Check if subscriber already exists
-            existing = self.get_subscriber(email)
-            if existing:
-                return False, "Subscriber already exists"
-            
-            # Insert new subscriber
+            # Insert new subscriber; only a duplicate email is a no-op, other
+            # constraint failures still raise
             query = '''
                 INSERT INTO subscribers (email, name, company, segment, source, custom_fields, tags)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(email) DO NOTHING
+                RETURNING id
             '''
             params = (
                 email, name, company, segment, source,
-                json.dumps(custom_fields) if custom_fields else None,
-                json.dumps(tags) if tags else None
+                _encode_json(custom_fields),
+                _encode_tags(tags)
             )
             
             cursor = self.db.execute(query, params)
+            inserted = cursor.fetchone() is not None
             self.db.commit()
-            
+
+            if not inserted:
+                return False, "Subscriber already exists"
+
             logger.info(f"Added subscriber: {email}")
             return True, "Subscriber added successfully"
             
@@ -74,13 +101,12 @@ class SubscriberManager:
             set_clauses = []
             params = []
             
+            encoders = self._UPDATE_ENCODERS
             for field, value in updates.items():
-                if field in ['name', 'company', 'segment', 'source']:
-                    set_clauses.append(f"{field} = ?")
-                    params.append(value)
-                elif field in ['custom_fields', 'tags']:
+                encode = encoders.get(field)
+                if encode is not None:
                     set_clauses.append(f"{field} = ?")
-                    params.append(json.dumps(value) if value else None)
+                    params.append(encode(value))
             
             if not set_clauses:
                 return False, "No valid fields to update"
@@ -125,9 +151,15 @@ class SubscriberManager:
             self.db.rollback()
             return False, f"Error deleting subscriber: {str(e)}"
     
-    def list_subscribers(self, limit: int = 100, offset: int = 0, 
-                        segment: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List subscribers with pagination"""
+    def list_subscribers(self, limit: int = 100, *, cursor: Optional[Tuple[str, int]] = None,
+                        segment: Optional[str] = None) -> List[sqlite3.Row]:
+        """List subscribers with keyset pagination (newest first)
+        
+        Pass the value of next_cursor() for the previous page as `cursor` to
+        fetch the following page; each page costs the same regardless of depth.
+        Rows are returned as sqlite3.Row (name and index access, keys());
+        wrap with dict(row) only where a real dict is needed.
+        """
         try:
             query = "SELECT * FROM subscribers WHERE status = 'active'"
             params = []
@@ -136,20 +168,52 @@ class SubscriberManager:
                 query += " AND segment = ?"
                 params.append(segment)
             
-            query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+            if cursor:
+                query += " AND (created_at, id) < (?, ?)"
+                params.extend(cursor)
             
-            cursor = self.db.execute(query, params)
-            rows = cursor.fetchall()
+            query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params.append(limit)
             
-            return [dict(row) for row in rows]
+            return self.db.execute(query, params).fetchall()
             
         except Exception as e:
             logger.error(f"Error listing subscribers: {str(e)}")
             return []
     
+    @staticmethod
+    def next_cursor(rows: List[sqlite3.Row]) -> Optional[Tuple[str, int]]:
+        """Get the list_subscribers cursor that follows a page of rows"""
+        if not rows:
+            return None
+        return rows[-1]['created_at'], rows[-1]['id']
+    
     def get_subscriber_count(self, segment: Optional[str] = None) -> int:
         """Get total subscriber count"""
+        try:
+            # Maintained by triggers (see create_tables), so no table scan
+            query = "SELECT COALESCE(SUM(n), 0) as count FROM subscriber_counts"
+            params = []
+            
+            if segment:
+                query += " WHERE segment = ?"
+                params.append(segment)
+            
+            try:
+                cursor = self.db.execute(query, params)
+            except sqlite3.OperationalError:
+                # Database created without the counter table: count directly
+                return self._count_active_subscribers(segment)
+            row = cursor.fetchone()
+            
+            return row['count'] if row else 0
+            
+        except Exception as e:
+            logger.error(f"Error getting subscriber count: {str(e)}")
+            return 0
+    
+    def _count_active_subscribers(self, segment: Optional[str] = None) -> int:
+        """Count active subscribers with a scan of the subscribers table"""
         try:
             query = "SELECT COUNT(*) as count FROM subscribers WHERE status = 'active'"
             params = []
@@ -175,7 +239,8 @@ class SubscriberManager:
                 SET engagement_score = ?, last_engaged = ?, updated_at = ?
                 WHERE email = ?
             '''
-            params = (score, datetime.utcnow(), datetime.utcnow(), email)
+            now = datetime.utcnow()
+            params = (score, now, now, email)
             
             cursor = self.db.execute(query, params)
             self.db.commit()
@@ -186,3 +251,31 @@ class SubscriberManager:
             logger.error(f"Error updating engagement score for {email}: {str(e)}")
             self.db.rollback()
             return False
+    
+    def update_engagement_scores_bulk(self, emails: Sequence[str], scores: Sequence[float]) -> int:
+        """Update engagement scores for many subscribers in one transaction
+        
+        Takes parallel columns (lists, tuples or numpy arrays) rather than
+        per-subscriber dicts. Returns the number of rows updated.
+        """
+        if len(emails) != len(scores):
+            raise ValueError("emails and scores must have the same length")
+        
+        try:
+            query = '''
+                UPDATE subscribers 
+                SET engagement_score = ?, last_engaged = ?, updated_at = ?
+                WHERE email = ?
+            '''
+            now = datetime.utcnow()
+            params = ((float(score), now, now, str(email)) for email, score in zip(emails, scores))
+            
+            cursor = self.db.executemany(query, params)
+            self.db.commit()
+            
+            return cursor.rowcount
+            
+        except Exception as e:
+            logger.error(f"Error bulk updating engagement scores: {str(e)}")
+            self.db.rollback()
+            return 0
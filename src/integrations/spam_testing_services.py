@@ -1,24 +1,101 @@
-import requests
+import aiohttp
 import re
 import os
 import asyncio
-import hashlib
+import secrets
 import base64
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from datetime import datetime
 import json
 
+try:
+    import ahocorasick  # optional: pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+SPAM_WORDS = (
+    'free', 'guarantee', 'urgent', 'act now', 'limited time',
+    'click here', 'buy now', 'special offer', 'congratulations',
+    'winner', 'cash', 'money', 'income', 'earn', 'profit'
+)
+
+# All spam words as a single alternation so content is scanned once; the
+# lookahead makes matches zero-width, so overlapping words are all reported
+# just as the Aho-Corasick automaton reports them
+_SPAM_WORDS_RE = re.compile('(?=(' + '|'.join(map(re.escape, SPAM_WORDS)) + '))', re.IGNORECASE)
+
+# Aho-Corasick automaton over the same words, used when pyahocorasick is installed
+_SPAM_AUTOMATON = None
+if ahocorasick is not None:
+    _SPAM_AUTOMATON = ahocorasick.Automaton()
+    for _word in SPAM_WORDS:
+        _SPAM_AUTOMATON.add_word(_word, _word)
+    _SPAM_AUTOMATON.make_automaton()
+
+# Common issue patterns in Mail-Tester reports, compiled once
+_ISSUE_PATTERNS = tuple(
+    (issue_type, re.compile(pattern, re.IGNORECASE))
+    for issue_type, pattern in (
+        ('spf_fail', r'SPF.*fail'),
+        ('dkim_fail', r'DKIM.*fail'),
+        ('dmarc_fail', r'DMARC.*fail'),
+        ('blacklist', r'blacklist'),
+        ('spam_words', r'spam.*word'),
+        ('missing_unsubscribe', r'unsubscribe.*link')
+    )
+)
+
+# Mail-Tester score line, matched on the raw report bytes
+_SCORE_RE = re.compile(rb'Your score:\s*(\d+\.?\d*)/10')
+
+# Upper bound on how much of a Mail-Tester report page is read and parsed
+MAIL_TESTER_MAX_REPORT_BYTES = 256 * 1024
+
 class SpamTestingServices:
     def __init__(self):
         self.glockapps_api_key = os.environ.get('GLOCKAPPS_API_KEY')
         self.litmus_api_key = os.environ.get('LITMUS_API_KEY')
         self.mail_tester_base_url = "https://www.mail-tester.com"
         
+        # Keep-alive session, created on first use inside the event loop and
+        # closed by run_comprehensive_test or on leaving `async with`
+        self._http: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it if needed"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._http
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _read_capped(self, response: aiohttp.ClientResponse, limit: int) -> bytes:
+        """Read at most `limit` bytes of a response body"""
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) >= limit:
+                break
+        return bytes(body[:limit])
+        
     async def test_with_mail_tester(self, html_content: str, from_email: str, subject: str) -> Dict:
         """Test email with mail-tester.com"""
         try:
             # Generate unique test address
-            test_id = hashlib.md5(f"{datetime.now().isoformat()}".encode()).hexdigest()[:10]
+            test_id = secrets.token_hex(5)
             test_email = f"test-{test_id}@mail-tester.com"
             
             print(f"📧 Testing with Mail-Tester: {test_email}")
@@ -32,14 +109,20 @@ class SpamTestingServices:
             
             # Get results
             try:
-                response = requests.get(f"{self.mail_tester_base_url}/test-{test_id}", timeout=30)
+                session = await self._get_session()
+                async with session.get(
+                    f"{self.mail_tester_base_url}/test-{test_id}",
+                    headers={'Accept-Encoding': 'gzip, deflate'}
+                ) as response:
+                    body = await self._read_capped(response, MAIL_TESTER_MAX_REPORT_BYTES)
+                    charset = response.charset or 'utf-8'
                 
                 # Parse score
-                score_match = re.search(r'Your score:\s*(\d+\.?\d*)/10', response.text)
+                score_match = _SCORE_RE.search(body)
                 score = float(score_match.group(1)) if score_match else 0
                 
                 # Parse issues
-                issues = self._parse_mail_tester_issues(response.text)
+                issues = self._parse_mail_tester_issues(body.decode(charset, errors='replace'))
                 
                 return {
                     'service': 'mail-tester',
@@ -52,7 +135,7 @@ class SpamTestingServices:
                     'status': 'pass' if score >= 8 else 'warning' if score >= 6 else 'fail'
                 }
                 
-            except requests.RequestException as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 return {
                     'service': 'mail-tester',
                     'error': f"Failed to get results: {str(e)}",
@@ -77,25 +160,20 @@ class SpamTestingServices:
     
     def _analyze_content_for_spam(self, content: str) -> List[str]:
         """Analyze content for spam indicators"""
-        spam_words = [
-            'free', 'guarantee', 'urgent', 'act now', 'limited time',
-            'click here', 'buy now', 'special offer', 'congratulations',
-            'winner', 'cash', 'money', 'income', 'earn', 'profit'
-        ]
-        
-        found_indicators = []
-        content_lower = content.lower()
-        
-        for word in spam_words:
-            if word in content_lower:
-                found_indicators.append(word)
+        # One scan for every spam word, reported once each in first-seen order
+        if _SPAM_AUTOMATON is not None:
+            matches = (word for _, word in _SPAM_AUTOMATON.iter(content.lower()))
+        else:
+            matches = (match.group(1).lower() for match in _SPAM_WORDS_RE.finditer(content))
+        found_indicators = list(dict.fromkeys(matches))
         
         # Check for excessive punctuation
         if content.count('!') > 3:
             found_indicators.append('excessive_exclamation')
         
-        # Check for all caps
-        if len([c for c in content if c.isupper()]) / len(content) > 0.3:
+        # Check for all caps; str.isupper counts accented, Greek and Cyrillic capitals too
+        total_chars = len(content)
+        if total_chars and sum(map(str.isupper, content)) / total_chars > 0.3:
             found_indicators.append('excessive_caps')
         
         return found_indicators
@@ -105,17 +183,8 @@ class SpamTestingServices:
         issues = []
         
         # Look for common issue patterns
-        issue_patterns = {
-            'spf_fail': r'SPF.*fail',
-            'dkim_fail': r'DKIM.*fail',
-            'dmarc_fail': r'DMARC.*fail',
-            'blacklist': r'blacklist',
-            'spam_words': r'spam.*word',
-            'missing_unsubscribe': r'unsubscribe.*link'
-        }
-        
-        for issue_type, pattern in issue_patterns.items():
-            if re.search(pattern, html_content, re.IGNORECASE):
+        for issue_type, pattern in _ISSUE_PATTERNS:
+            if pattern.search(html_content):
                 issues.append({
                     'type': issue_type,
                     'severity': 'high' if issue_type in ['blacklist', 'spf_fail'] else 'medium',
@@ -163,8 +232,10 @@ class SpamTestingServices:
             }
         
         try:
+            session = await self._get_session()
+            
             # Create test
-            response = requests.post(
+            async with session.post(
                 'https://api.glockapps.com/v1/tests',
                 headers={'Authorization': f'Bearer {self.glockapps_api_key}'},
                 json={
@@ -173,18 +244,16 @@ class SpamTestingServices:
                     'subject': campaign_data.get('subject'),
                     'html': campaign_data.get('html_content'),
                     'text': campaign_data.get('text_content')
-                },
-                timeout=30
-            )
-            
-            if response.status_code != 201:
-                return {
-                    'service': 'glockapps',
-                    'error': f'Failed to create test: {response.status_code}',
-                    'response': response.text
                 }
-            
-            test_id = response.json()['id']
+            ) as response:
+                if response.status != 201:
+                    return {
+                        'service': 'glockapps',
+                        'error': f'Failed to create test: {response.status}',
+                        'response': await response.text()
+                    }
+                
+                test_id = (await response.json())['id']
             print(f"📊 GlockApps test created: {test_id}")
             
             # Wait for results
@@ -192,22 +261,20 @@ class SpamTestingServices:
             await asyncio.sleep(300)  # 5 minutes
             
             # Get results
-            results_response = requests.get(
+            async with session.get(
                 f'https://api.glockapps.com/v1/tests/{test_id}/results',
-                headers={'Authorization': f'Bearer {self.glockapps_api_key}'},
-                timeout=30
-            )
-            
-            if results_response.status_code == 200:
-                return self._parse_glockapps_results(results_response.json())
-            else:
-                return {
-                    'service': 'glockapps',
-                    'error': f'Failed to get results: {results_response.status_code}',
-                    'test_id': test_id
-                }
+                headers={'Authorization': f'Bearer {self.glockapps_api_key}'}
+            ) as results_response:
+                if results_response.status == 200:
+                    return self._parse_glockapps_results(await results_response.json())
+                else:
+                    return {
+                        'service': 'glockapps',
+                        'error': f'Failed to get results: {results_response.status}',
+                        'test_id': test_id
+                    }
                 
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             return {
                 'service': 'glockapps',
                 'error': f'Request failed: {str(e)}'
@@ -264,8 +331,10 @@ class SpamTestingServices:
             }
         
         try:
+            session = await self._get_session()
+            
             # Create email test
-            response = requests.post(
+            async with session.post(
                 'https://api.litmus.com/v1/emails',
                 headers={
                     'Authorization': f'Basic {base64.b64encode(f"{self.litmus_api_key}:".encode()).decode()}',
@@ -277,25 +346,23 @@ class SpamTestingServices:
                     'text_body': campaign_data.get('text_content'),
                     'from_name': campaign_data.get('from_name'),
                     'from_email': campaign_data.get('from_email')
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 201:
-                test_data = response.json()
-                return {
-                    'service': 'litmus',
-                    'test_id': test_data.get('id'),
-                    'test_url': test_data.get('url'),
-                    'status': 'created',
-                    'message': 'Test created successfully. Check Litmus dashboard for results.'
-                }
-            else:
-                return {
-                    'service': 'litmus',
-                    'error': f'Failed to create test: {response.status_code}',
-                    'response': response.text
                 }
+            ) as response:
+                if response.status == 201:
+                    test_data = await response.json()
+                    return {
+                        'service': 'litmus',
+                        'test_id': test_data.get('id'),
+                        'test_url': test_data.get('url'),
+                        'status': 'created',
+                        'message': 'Test created successfully. Check Litmus dashboard for results.'
+                    }
+                else:
+                    return {
+                        'service': 'litmus',
+                        'error': f'Failed to create test: {response.status}',
+                        'response': await response.text()
+                    }
                 
         except Exception as e:
             return {
@@ -317,22 +384,35 @@ class SpamTestingServices:
         }
         
         # Test with Mail-Tester
-        mail_tester_result = await self.test_with_mail_tester(
-            campaign_data.get('html_content', ''),
-            campaign_data.get('from_email', ''),
-            campaign_data.get('subject', '')
-        )
-        results['services']['mail_tester'] = mail_tester_result
+        tests = {
+            'mail_tester': self.test_with_mail_tester(
+                campaign_data.get('html_content', ''),
+                campaign_data.get('from_email', ''),
+                campaign_data.get('subject', '')
+            )
+        }
         
         # Test with GlockApps if available
         if self.glockapps_api_key:
-            glockapps_result = await self.test_with_glockapps(campaign_data)
-            results['services']['glockapps'] = glockapps_result
+            tests['glockapps'] = self.test_with_glockapps(campaign_data)
         
         # Test with Litmus if available
         if self.litmus_api_key:
-            litmus_result = await self.test_with_litmus(campaign_data)
-            results['services']['litmus'] = litmus_result
+            tests['litmus'] = self.test_with_litmus(campaign_data)
+        
+        # Services are independent, so their waits overlap; the session is
+        # closed afterwards so it never outlives this call's event loop
+        try:
+            service_results = await asyncio.gather(*tests.values(), return_exceptions=True)
+        finally:
+            await self.close()
+        for name, service_result in zip(tests, service_results):
+            if isinstance(service_result, Exception):
+                service_result = {
+                    'service': name.replace('_', '-'),
+                    'error': str(service_result)
+                }
+            results['services'][name] = service_result
         
         # Calculate overall score
         scores = []
@@ -346,13 +426,12 @@ class SpamTestingServices:
             results['overall_score'] = sum(scores) / len(scores)
             results['safe_to_send'] = results['overall_score'] >= 80
         
-        # Compile recommendations
-        all_recommendations = []
+        # Compile recommendations, dropping duplicates but keeping first-seen order
+        all_recommendations: Dict[str, None] = {}
         for service_result in results['services'].values():
-            if 'recommendations' in service_result:
-                all_recommendations.extend(service_result['recommendations'])
+            all_recommendations.update(dict.fromkeys(service_result.get('recommendations', ())))
         
-        results['recommendations'] = list(set(all_recommendations))  # Remove duplicates
+        results['recommendations'] = list(all_recommendations)
         
         print(f"✅ Comprehensive test complete. Overall score: {results['overall_score']:.1f}%")
         return results
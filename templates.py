@@ -1,9 +1,25 @@
 # templates.py
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+from jinja2 import Environment
 
-def get_email_template():
-    """Return optimized email template for deliverability"""
-    
-    html_template = """
+# Whitespace that only pads the source: between tags, line indentation, and inside <style>
+_INTERTAG_WS_RE = re.compile(r'>\s+<')
+_LINE_INDENT_RE = re.compile(r'\n\s+')
+_STYLE_BLOCK_RE = re.compile(r'(<style>)(.*?)(</style>)', re.DOTALL)
+_WS_RUN_RE = re.compile(r'\s+')
+
+def _minify_html(source: str) -> str:
+    """Drop source indentation from an HTML template (run once, at import)"""
+    html = _INTERTAG_WS_RE.sub('><', source.strip())
+    html = _LINE_INDENT_RE.sub('\n', html)
+    return _STYLE_BLOCK_RE.sub(
+        lambda m: m.group(1) + _WS_RUN_RE.sub(' ', m.group(2)).strip() + m.group(3), html
+    )
+
+# Template sources are module constants so they are built and minified once at import
+_HTML_TEMPLATE_SRC = _minify_html("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -40,9 +56,9 @@ def get_email_template():
     </div>
 </body>
 </html>
-"""
-    
-    text_template = """
+""")
+
+_TEXT_TEMPLATE_SRC = """
 Hi {{name}},
 
 {{content}}
@@ -59,6 +75,78 @@ Phone: (555) 123-4567
 You're receiving this because you subscribed to our newsletter.
 Unsubscribe: {{unsubscribe_link}}
 Update Preferences: {{preferences_link}}
-"""
+""".strip()
+
+# {{name}} placeholder in the template sources
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+def _split_template(source: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split a {{name}} template into its static text and the names between it"""
+    pieces = _PLACEHOLDER_RE.split(source)
+    return tuple(pieces[0::2]), tuple(pieces[1::2])
+
+def _render(parts: Tuple[Tuple[str, ...], Tuple[str, ...]], values: Dict[str, str]) -> str:
+    """Interleave precomputed static text with values in one join (missing -> '')"""
+    literals, names = parts
+    out = [literals[0]]
+    for name, literal in zip(names, literals[1:]):
+        out.append(values.get(name, ''))
+        out.append(literal)
+    return ''.join(out)
+
+def _bake(parts: Tuple[Tuple[str, ...], Tuple[str, ...]], values: Dict[str, str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Substitute some placeholders into the static text, keeping the rest open"""
+    literals, names = parts
+    baked_literals = [literals[0]]
+    baked_names = []
+    for name, literal in zip(names, literals[1:]):
+        if name in values:
+            baked_literals[-1] += values[name] + literal
+        else:
+            baked_names.append(name)
+            baked_literals.append(literal)
+    return tuple(baked_literals), tuple(baked_names)
+
+_HTML_PARTS = _split_template(_HTML_TEMPLATE_SRC)
+_TEXT_PARTS = _split_template(_TEXT_TEMPLATE_SRC)
+
+# Subject and content are shared by every recipient of a campaign, so the
+# template with those filled in is cached and only per-recipient fields vary
+@lru_cache(maxsize=64)
+def _html_skeleton(subject: str, content: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    return _bake(_HTML_PARTS, {'subject': subject, 'content': content})
+
+@lru_cache(maxsize=64)
+def _text_skeleton(content: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    return _bake(_TEXT_PARTS, {'content': content})
+
+# One shared environment; content is pre-built HTML, so it is not autoescaped
+_JINJA_ENV = Environment(autoescape=False, cache_size=400)
+
+def get_email_template():
+    """Return optimized email template for deliverability"""
+    return _HTML_TEMPLATE_SRC, _TEXT_TEMPLATE_SRC
+
+@lru_cache(maxsize=1)
+def get_compiled_email_template():
+    """Return the email templates compiled once as jinja2 Templates
     
-    return html_template, text_template
\ No newline at end of file
+    Render with html.render(subject=..., name=..., content=...,
+    unsubscribe_link=..., preferences_link=...) instead of compiling the
+    template strings for every message.
+    """
+    return _JINJA_ENV.from_string(_HTML_TEMPLATE_SRC), _JINJA_ENV.from_string(_TEXT_TEMPLATE_SRC)
+
+def render_html(subject: str = '', name: str = '', content: str = '',
+                unsubscribe_link: str = '', preferences_link: str = '') -> str:
+    """Render the HTML email body without going through jinja2"""
+    return _render(_html_skeleton(subject, content), {
+        'name': name, 'unsubscribe_link': unsubscribe_link, 'preferences_link': preferences_link
+    })
+
+def render_text(name: str = '', content: str = '',
+                unsubscribe_link: str = '', preferences_link: str = '') -> str:
+    """Render the plain-text email body without going through jinja2"""
+    return _render(_text_skeleton(content), {
+        'name': name, 'unsubscribe_link': unsubscribe_link, 'preferences_link': preferences_link
+    })
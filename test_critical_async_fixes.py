@@ -8,14 +8,32 @@ Tests the fixes for:
 """
 
 import asyncio
+import inspect
 import pytest
 import sys
-import os
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, AsyncMock
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+# Under pytest, run every async test here on one shared event loop (pytest-asyncio)
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+# Fixed campaign send result returned by the mocked email engine
+_FROZEN_NOW = datetime(2024, 1, 1)
+_CAMPAIGN_RESULT = SimpleNamespace(
+    sent_count=10,
+    total_recipients=10,
+    failed_count=0,
+    esp_distribution={'test_esp': 10},
+    start_time=_FROZEN_NOW,
+    end_time=_FROZEN_NOW
+)
 
 class TestCriticalAsyncFixes:
     """Test suite for critical async/await bug fixes"""
@@ -27,30 +45,20 @@ class TestCriticalAsyncFixes:
     
     async def test_async_campaign_send_endpoint(self):
         """Test that campaign send endpoint properly handles async operations"""
-        print("\n1. Testing Async Campaign Send Endpoint")
-        print("-" * 40)
+        lines = ["\n1. Testing Async Campaign Send Endpoint", "-" * 40]
         
         try:
             from src.api.routes import send_campaign
-            from src.core.email_engine import EmailDeliveryEngine
-            from src.database.async_models import AsyncDatabaseManager
             
-            # Mock database session
-            mock_db = Mock(spec=AsyncDatabaseManager)
+            # Mock database session; a list spec avoids introspecting the whole class
+            mock_db = Mock(spec=['execute_query', 'execute_update', 'get_connection'])
             mock_db.execute_query = AsyncMock(return_value=[])
             mock_db.execute_update = AsyncMock(return_value=1)
             
             # Mock email engine
             with patch('src.api.routes.EmailDeliveryEngine') as mock_engine_class:
                 mock_engine = Mock()
-                mock_engine.send_campaign = AsyncMock(return_value=Mock(
-                    sent_count=10,
-                    total_recipients=10,
-                    failed_count=0,
-                    esp_distribution={'test_esp': 10},
-                    start_time=datetime.now(),
-                    end_time=datetime.now()
-                ))
+                mock_engine.send_campaign = AsyncMock(return_value=_CAMPAIGN_RESULT)
                 mock_engine_class.return_value = mock_engine
                 
                 # Test async call
@@ -64,53 +72,52 @@ class TestCriticalAsyncFixes:
                 # Verify async method was called
                 mock_engine.send_campaign.assert_called_once_with(1, False)
                 
-                print("✅ Campaign send endpoint correctly uses async/await")
-                print(f"   Result: {result['success']}")
-                return True
+                lines.append("✅ Campaign send endpoint correctly uses async/await")
+                lines.append(f"   Result: {result['success']}")
                 
         except Exception as e:
-            print(f"❌ Campaign send endpoint test failed: {str(e)}")
-            return False
+            lines.append(f"❌ Campaign send endpoint test failed: {str(e)}")
+            raise
+        finally:
+            print("\n".join(lines))
     
     async def test_database_session_management(self):
         """Test proper database session lifecycle management"""
-        print("\n2. Testing Database Session Management")
-        print("-" * 40)
+        lines = ["\n2. Testing Database Session Management", "-" * 40]
         
         try:
             from src.api.routes import get_async_db_session
-            from src.database.async_models import get_async_db
             
             # Test session dependency
             async for session in get_async_db_session():
                 # Verify we get a proper database manager
-                assert hasattr(session, 'execute_query')
-                assert hasattr(session, 'execute_update')
-                assert hasattr(session, 'get_connection')
+                required = {'execute_query', 'execute_update', 'get_connection'}
+                missing = required - set(dir(session))
+                assert not missing, f"Session missing methods: {sorted(missing)}"
                 
-                print("✅ Database session properly initialized")
+                lines.append("✅ Database session properly initialized")
                 
                 # Test that session handles operations correctly
                 try:
                     # This should not raise an exception
                     result = await session.execute_query("SELECT 1", ())
-                    print("✅ Database session can execute queries")
+                    lines.append("✅ Database session can execute queries")
                 except Exception as e:
-                    print(f"⚠️ Database query test failed (expected in test env): {str(e)}")
+                    lines.append(f"⚠️ Database query test failed (expected in test env): {str(e)}")
                 
                 break  # Only test first iteration
             
-            print("✅ Database session management working correctly")
-            return True
+            lines.append("✅ Database session management working correctly")
             
         except Exception as e:
-            print(f"❌ Database session management test failed: {str(e)}")
-            return False
+            lines.append(f"❌ Database session management test failed: {str(e)}")
+            raise
+        finally:
+            print("\n".join(lines))
     
     async def test_real_imap_placement_testing(self):
         """Test real IMAP inbox placement testing implementation"""
-        print("\n3. Testing Real IMAP Inbox Placement Testing")
-        print("-" * 40)
+        lines = ["\n3. Testing Real IMAP Inbox Placement Testing", "-" * 40]
         
         try:
             from src.core.inbox_placement_tester import InboxPlacementTester, SeedAccount
@@ -131,16 +138,12 @@ class TestCriticalAsyncFixes:
                 '_send_via_basic_smtp'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(tester, method):
-                    missing_methods.append(method)
+            attrs = set(dir(tester))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
-            if missing_methods:
-                print(f"❌ Missing methods: {missing_methods}")
-                return False
+            assert not missing_methods, f"Missing methods: {missing_methods}"
             
-            print("✅ All required IMAP methods implemented")
+            lines.append("✅ All required IMAP methods implemented")
             
             # Test folder mapping
             gmail_folders = tester._get_folders_for_provider('gmail')
@@ -151,7 +154,7 @@ class TestCriticalAsyncFixes:
             assert ('INBOX', 'inbox') in gmail_folders
             assert ('INBOX', 'inbox') in outlook_folders
             
-            print("✅ Provider-specific folder mappings working")
+            lines.append("✅ Provider-specific folder mappings working")
             
             # Test error result creation
             test_seed = SeedAccount(
@@ -165,41 +168,36 @@ class TestCriticalAsyncFixes:
             assert error_result.folder == 'error'
             assert error_result.seed_email == "test@example.com"
             
-            print("✅ Error handling working correctly")
-            print("✅ Real IMAP placement testing implemented")
-            return True
+            lines.append("✅ Error handling working correctly")
+            lines.append("✅ Real IMAP placement testing implemented")
             
         except Exception as e:
-            print(f"❌ IMAP placement testing test failed: {str(e)}")
-            return False
+            lines.append(f"❌ IMAP placement testing test failed: {str(e)}")
+            raise
+        finally:
+            print("\n".join(lines))
     
     async def test_async_consistency_across_routes(self):
         """Test that all route endpoints use consistent async patterns"""
-        print("\n4. Testing Async Consistency Across Routes")
-        print("-" * 40)
+        lines = ["\n4. Testing Async Consistency Across Routes", "-" * 40]
         
         try:
-            import inspect
             from src.api import routes
             
-            # Get all route functions
-            route_functions = []
-            for name in dir(routes):
-                obj = getattr(routes, name)
-                if callable(obj) and not name.startswith('_'):
-                    route_functions.append((name, obj))
-            
+            # Classify public callables in one pass over the module namespace
             async_routes = []
             sync_routes = []
             
-            for name, func in route_functions:
-                if inspect.iscoroutinefunction(func):
+            for name, obj in vars(routes).items():
+                if name.startswith('_') or not callable(obj):
+                    continue
+                if inspect.iscoroutinefunction(obj):
                     async_routes.append(name)
-                elif callable(func):
+                else:
                     sync_routes.append(name)
             
-            print(f"✅ Found {len(async_routes)} async routes")
-            print(f"✅ Found {len(sync_routes)} sync routes")
+            lines.append(f"✅ Found {len(async_routes)} async routes")
+            lines.append(f"✅ Found {len(sync_routes)} sync routes")
             
             # Key routes that should be async
             critical_async_routes = [
@@ -212,16 +210,15 @@ class TestCriticalAsyncFixes:
                 if route not in async_routes:
                     missing_async.append(route)
             
-            if missing_async:
-                print(f"❌ Critical routes not async: {missing_async}")
-                return False
+            assert not missing_async, f"Critical routes not async: {missing_async}"
             
-            print("✅ All critical routes are properly async")
-            return True
+            lines.append("✅ All critical routes are properly async")
             
         except Exception as e:
-            print(f"❌ Async consistency test failed: {str(e)}")
-            return False
+            lines.append(f"❌ Async consistency test failed: {str(e)}")
+            raise
+        finally:
+            print("\n".join(lines))
     
     async def run_all_tests(self):
         """Run all critical fix tests"""
@@ -235,14 +232,17 @@ class TestCriticalAsyncFixes:
             self.test_async_consistency_across_routes
         ]
         
+        # The tests are independent, so their awaits overlap; each one
+        # prints its collected lines in a single call when it finishes
+        outcomes = await asyncio.gather(*(test() for test in tests), return_exceptions=True)
+        
         results = []
-        for test in tests:
-            try:
-                result = await test()
-                results.append(result)
-            except Exception as e:
-                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+        for test, outcome in zip(tests, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"❌ Test {test.__name__} failed with exception: {str(outcome)}")
                 results.append(False)
+            else:
+                results.append(True)
         
         # Summary
         print("\n" + "=" * 60)
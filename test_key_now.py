@@ -1,27 +1,81 @@
 import os
+import sys
+import time
+import asyncio
+import hashlib
+import httpx
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 
-# Load your .env file
-load_dotenv()
+# Load your .env file (no ${VAR} expansion, real environment wins)
+load_dotenv(override=False, interpolate=False)
 
-api_key = os.getenv('SENDGRID_API_KEY')
-print(f"Testing API key: {api_key[:15]}...")
+SENDGRID_PROFILE_URL = "https://api.sendgrid.com/v3/user/profile"
 
-try:
-    sg = SendGridAPIClient(api_key)
+# Fingerprint of the last key that checked out; with --cached an unchanged
+# key skips the request until the entry is KEY_OK_TTL seconds old, so a
+# revoked key is caught again soon after
+KEY_OK_CACHE = os.path.expanduser('~/.cache/sendgrid_key_ok')
+KEY_OK_TTL = 15 * 60
+
+def _key_fingerprint(api_key: str) -> str:
+    return hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+
+def _read_cached_fingerprint() -> str:
+    try:
+        if time.time() - os.path.getmtime(KEY_OK_CACHE) > KEY_OK_TTL:
+            return ''
+        with open(KEY_OK_CACHE, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+def _write_cached_fingerprint(fingerprint: str):
+    try:
+        os.makedirs(os.path.dirname(KEY_OK_CACHE), exist_ok=True)
+        with open(KEY_OK_CACHE, 'w') as f:
+            f.write(fingerprint)
+    except OSError:
+        pass  # Caching is best-effort
+
+def _clear_cached_fingerprint():
+    try:
+        os.remove(KEY_OK_CACHE)
+    except OSError:
+        pass
+
+async def main():
+    api_key = os.getenv('SENDGRID_API_KEY')
+    print(f"Testing API key: {api_key[:15]}...")
+    
+    fingerprint = _key_fingerprint(api_key)
+    if '--cached' in sys.argv[1:] and fingerprint == _read_cached_fingerprint():
+        print(f"✅ API Key is VALID and working! (checked in the last {KEY_OK_TTL // 60} minutes)")
+        print("   Run without --cached to force a live check")
+        return
     
-    # Simple test - get user profile
-    response = sg.client.user.profile.get()
-    print("✅ API Key is VALID and working!")
+    try:
+        # Simple test - get user profile, without blocking on a sync client
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(
+                SENDGRID_PROFILE_URL,
+                headers={"Authorization": f"Bearer {api_key}"}
+            )
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return
     
-except Exception as e:
-    error_msg = str(e)
-    if "401" in error_msg:
+    if response.status_code == 200:
+        print("✅ API Key is VALID and working!")
+        _write_cached_fingerprint(fingerprint)
+    elif response.status_code in (401, 403):
+        _clear_cached_fingerprint()
         print("❌ API Key is INVALID or has wrong permissions")
         print("Fix: Create a new API key with 'Full Access' in SendGrid")
-    elif "verified Sender Identity" in error_msg:
+    elif "verified Sender Identity" in response.text:
         print("❌ You need to verify your email address first!")
         print("Fix: Go to SendGrid → Sender Authentication → Verify Single Sender")
     else:
-        print(f"❌ Error: {error_msg}")
\ No newline at end of file
+        print(f"❌ Error: HTTP {response.status_code}: {response.text}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
\ No newline at end of file
@@ -5,16 +5,20 @@ Tests all Phase 3 features for 98%+ inbox delivery rates
 """
 
 import asyncio
-import sys
+import importlib.util
 import os
-import json
 import time
 from datetime import datetime
 import requests
 from typing import Dict, List
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+def _module_exists(dotted: str) -> bool:
+    """Check a module is installed without executing it"""
+    try:
+        return importlib.util.find_spec(dotted) is not None
+    except (ImportError, ValueError):
+        # Parent package missing (find_spec imports parents) or broken spec
+        return False
 
 class Phase3TestSuite:
     def __init__(self):
@@ -69,10 +73,8 @@ class Phase3TestSuite:
                 'get_historical_performance', 'continuous_monitoring'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(tester, method):
-                    missing_methods.append(method)
+            attrs = set(dir(tester))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Inbox Placement Tester", True)
@@ -97,10 +99,8 @@ class Phase3TestSuite:
                 'run_comprehensive_test', 'get_service_status'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(spam_tester, method):
-                    missing_methods.append(method)
+            attrs = set(dir(spam_tester))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Spam Testing Services", True)
@@ -125,10 +125,8 @@ class Phase3TestSuite:
                 'setup_dane_tlsa', 'setup_tls_rpt', 'verify_all_authentication'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(auth_system, method):
-                    missing_methods.append(method)
+            attrs = set(dir(auth_system))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Advanced Authentication", True)
@@ -164,10 +162,8 @@ class Phase3TestSuite:
                 'get_isp_metrics', 'get_setup_status'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(fbl_manager, method):
-                    missing_methods.append(method)
+            attrs = set(dir(fbl_manager))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Feedback Loop Manager", True)
@@ -181,9 +177,11 @@ class Phase3TestSuite:
     def test_seed_accounts_configuration(self):
         """Test seed accounts configuration"""
         try:
-            if os.path.exists('config/seed_accounts.json'):
-                with open('config/seed_accounts.json', 'r') as f:
-                    seed_config = json.load(f)
+            from src.core.inbox_placement_tester import SEED_ACCOUNTS_CONFIG, load_seed_accounts_config
+            
+            if os.path.exists(SEED_ACCOUNTS_CONFIG):
+                # Same cached parse the placement tester uses
+                seed_config = load_seed_accounts_config()
                 
                 # Check structure
                 required_keys = ['accounts', 'setup_instructions', 'monitoring_schedule']
@@ -209,7 +207,9 @@ class Phase3TestSuite:
             from src.api.routes import app
             
             # Check for Phase 3 endpoints
-            routes = [route.path for route in app.routes]
+            # All paths newline-joined: a pattern (which has no newlines) is found
+            # in this string exactly when it is a substring of some route path
+            route_paths = '\n'.join(route.path for route in app.routes)
             
             phase3_endpoints = [
                 '/campaigns/{campaign_id}/inbox-placement-test',
@@ -227,7 +227,7 @@ class Phase3TestSuite:
             for endpoint in phase3_endpoints:
                 # Check if endpoint pattern exists in routes
                 endpoint_pattern = endpoint.replace('{campaign_id}', '').replace('{isp}', '')
-                if any(endpoint_pattern in route for route in routes):
+                if endpoint_pattern in route_paths:
                     found_endpoints += 1
             
             if found_endpoints >= len(phase3_endpoints) * 0.8:
@@ -250,12 +250,7 @@ class Phase3TestSuite:
                 'googleapiclient'
             ]
             
-            missing_deps = []
-            for dep in dependencies:
-                try:
-                    __import__(dep)
-                except ImportError:
-                    missing_deps.append(dep)
+            missing_deps = [dep for dep in dependencies if not _module_exists(dep)]
             
             if not missing_deps:
                 self.log_test("Phase 3 Dependencies", True)
@@ -5,13 +5,8 @@ Tests actual inbox placement using real IMAP connections instead of simulated re
 """
 
 import asyncio
-import sys
-import os
 from datetime import datetime
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.core.inbox_placement_tester import InboxPlacementTester
 from src.database.async_models import get_async_db
 
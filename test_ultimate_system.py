@@ -5,17 +5,13 @@ Tests all advanced features for maximum deliverability
 """
 
 import asyncio
-import sys
 import os
-import json
+import orjson
 import time
 from datetime import datetime
 import requests
 from typing import Dict, List
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
 class UltimateSystemTestSuite:
     def __init__(self):
         self.passed = 0
@@ -57,10 +53,8 @@ class UltimateSystemTestSuite:
                 '_test_authentication', '_test_inbox_placement', '_check_link_reputation'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(tester, method):
-                    missing_methods.append(method)
+            attrs = set(dir(tester))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Advanced Inbox Placement Tester", True)
@@ -84,10 +78,8 @@ class UltimateSystemTestSuite:
                 '_check_blacklists', '_check_sender_score', 'continuous_monitoring'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(monitor, method):
-                    missing_methods.append(method)
+            attrs = set(dir(monitor))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Real-time Reputation Monitor", True)
@@ -129,10 +121,8 @@ class UltimateSystemTestSuite:
                 'create_referral_program', 'auto_engage_campaign'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(network, method):
-                    missing_methods.append(method)
+            attrs = set(dir(network))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Engagement Network System", True)
@@ -165,10 +155,8 @@ class UltimateSystemTestSuite:
                 '_optimize_send_times', '_create_domain_schedule', 'execute_intelligent_send'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(engine, method):
-                    missing_methods.append(method)
+            attrs = set(dir(engine))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Intelligent Sending Engine", True)
@@ -192,10 +180,8 @@ class UltimateSystemTestSuite:
                 '_detect_spam_indicators', '_optimize_subject_line', '_optimize_html_content'
             ]
             
-            missing_methods = []
-            for method in required_methods:
-                if not hasattr(optimizer, method):
-                    missing_methods.append(method)
+            attrs = set(dir(optimizer))
+            missing_methods = [method for method in required_methods if method not in attrs]
             
             if not missing_methods:
                 self.log_test("Advanced Content Optimizer", True)
@@ -243,7 +229,8 @@ class UltimateSystemTestSuite:
             from src.api.routes import app
             
             # Check for advanced endpoints
-            routes = [route.path for route in app.routes]
+            # Endpoints are matched by substring, so search one string of all paths
+            route_paths = '\n'.join(route.path for route in app.routes)
             
             advanced_endpoints = [
                 '/campaigns/{campaign_id}/test-placement',
@@ -259,7 +246,7 @@ class UltimateSystemTestSuite:
             for endpoint in advanced_endpoints:
                 # Check if endpoint pattern exists in routes
                 endpoint_pattern = endpoint.replace('{campaign_id}', '')
-                if any(endpoint_pattern in route for route in routes):
+                if endpoint_pattern in route_paths:
                     found_endpoints += 1
             
             if found_endpoints >= len(advanced_endpoints) * 0.8:
@@ -286,8 +273,8 @@ class UltimateSystemTestSuite:
             for config_file, required_keys in config_files.items():
                 if os.path.exists(config_file):
                     try:
-                        with open(config_file, 'r') as f:
-                            config = json.load(f)
+                        with open(config_file, 'rb') as f:
+                            config = orjson.loads(f.read())
                         
                         if all(key in config for key in required_keys):
                             complete_configs += 1
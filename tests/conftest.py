@@ -0,0 +1,13 @@
+# tests/conftest.py
+import pytest
+
+from src.database import models
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Connection to a fresh SQLite file with the full schema"""
+    monkeypatch.setattr(models, 'DATABASE_URL', str(tmp_path / 'test.db'))
+    models.create_tables()
+    sessions = models.get_db()
+    yield next(sessions)
+    sessions.close()
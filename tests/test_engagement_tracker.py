@@ -0,0 +1,50 @@
+# tests/test_engagement_tracker.py
+import pytest
+
+from src.database.engagement_tracker import EngagementTracker
+
+class TestCampaignsStats:
+    """Test the grouped get_campaigns_stats query"""
+    
+    @pytest.fixture
+    def tracker(self, db):
+        """Tracker over two campaigns with some deliveries and an open"""
+        tracker = EngagementTracker(db)
+        for campaign_id, sends in ((1, 4), (2, 2)):
+            for i in range(sends):
+                tracker.record_email_send(campaign_id, i, f'user{i}@example.com',
+                                          'test_esp', f'msg-{campaign_id}-{i}')
+        tracker.record_delivery('msg-1-0')
+        tracker.record_delivery('msg-1-1')
+        tracker.record_open('msg-1-0')
+        tracker.record_delivery('msg-2-0')
+        return tracker
+    
+    def test_matches_single_campaign_stats(self, tracker):
+        """Test grouped stats against the per-campaign query"""
+        stats = tracker.get_campaigns_stats([1, 2])
+        
+        for campaign_id in (1, 2):
+            grouped = dict(stats[campaign_id])
+            assert grouped.pop('campaign_id') == campaign_id
+            assert grouped == tracker.get_campaign_stats(campaign_id)
+    
+    def test_counts_and_rates(self, tracker):
+        """Test grouped counts and rates"""
+        stats = tracker.get_campaigns_stats([1, 2])
+        
+        assert stats[1]['total_sent'] == 4
+        assert stats[1]['delivered'] == 2
+        assert stats[1]['opened'] == 1
+        assert stats[1]['delivery_rate'] == 50.0
+        assert stats[1]['open_rate'] == 25.0
+        assert stats[2]['total_sent'] == 2
+        assert stats[2]['delivery_rate'] == 50.0
+    
+    def test_campaigns_without_sends_are_omitted(self, tracker):
+        """Test that campaigns without sends are left out"""
+        assert set(tracker.get_campaigns_stats([1, 99])) == {1}
+    
+    def test_empty_ids(self, tracker):
+        """Test that no campaign ids means no query"""
+        assert tracker.get_campaigns_stats([]) == {}
@@ -0,0 +1,136 @@
+# tests/test_subscriber_manager.py
+import pytest
+
+from src.database import models
+from src.database.subscriber_manager import SubscriberManager
+
+@pytest.fixture
+def manager(db):
+    """Subscriber manager on the test database"""
+    return SubscriberManager(db)
+
+class TestSubscriberCounts:
+    """Test the trigger-maintained subscriber_counts table"""
+    
+    def assert_counts_match(self, manager, *segments):
+        """Counter table agrees with a live COUNT(*) overall and per segment"""
+        assert manager.get_subscriber_count() == manager._count_active_subscribers()
+        for segment in segments:
+            assert manager.get_subscriber_count(segment) == manager._count_active_subscribers(segment)
+    
+    def test_insert_increments_count(self, manager):
+        """Test that inserts bump the total and per-segment counts"""
+        manager.add_subscriber('a@example.com', 'A')
+        manager.add_subscriber('b@example.com', 'B', segment='vip')
+        
+        assert manager.get_subscriber_count() == 2
+        assert manager.get_subscriber_count('general') == 1
+        assert manager.get_subscriber_count('vip') == 1
+        self.assert_counts_match(manager, 'general', 'vip')
+    
+    def test_duplicate_insert_does_not_fire_trigger(self, manager):
+        """Test that a duplicate email insert leaves the counts alone"""
+        assert manager.add_subscriber('a@example.com', 'A') == (True, "Subscriber added successfully")
+        assert manager.add_subscriber('a@example.com', 'A') == (False, "Subscriber already exists")
+        
+        assert manager.get_subscriber_count() == 1
+        self.assert_counts_match(manager, 'general')
+    
+    def test_soft_delete_decrements_count(self, manager):
+        """Test that soft-deleting a subscriber decrements the counts"""
+        manager.add_subscriber('a@example.com', 'A', segment='vip')
+        manager.add_subscriber('b@example.com', 'B', segment='vip')
+        
+        success, _ = manager.delete_subscriber('a@example.com')
+        
+        assert success
+        assert manager.get_subscriber_count() == 1
+        assert manager.get_subscriber_count('vip') == 1
+        self.assert_counts_match(manager, 'vip')
+    
+    def test_segment_change_moves_count(self, manager):
+        """Test that a segment change moves one count between segments"""
+        manager.add_subscriber('a@example.com', 'A')
+        manager.add_subscriber('b@example.com', 'B')
+        
+        success, _ = manager.update_subscriber('a@example.com', segment='vip')
+        
+        assert success
+        assert manager.get_subscriber_count() == 2
+        assert manager.get_subscriber_count('general') == 1
+        assert manager.get_subscriber_count('vip') == 1
+        self.assert_counts_match(manager, 'general', 'vip')
+    
+    def test_create_tables_rerun_keeps_counts(self, manager):
+        """Test that re-running create_tables does not reseed the counts"""
+        manager.add_subscriber('a@example.com', 'A')
+        
+        models.create_tables()
+        
+        assert manager.get_subscriber_count() == 1
+
+class TestListSubscribers:
+    """Test keyset pagination in list_subscribers"""
+    
+    def test_pages_cover_rows_with_same_created_at(self, db, manager):
+        """Test paging through rows that share a created_at"""
+        for i in range(7):
+            manager.add_subscriber(f'user{i}@example.com', f'User {i}')
+        # Every row shares one created_at, so id alone has to break the ties
+        db.execute("UPDATE subscribers SET created_at = '2024-01-01 00:00:00'")
+        db.commit()
+        
+        emails = []
+        cursor = None
+        while True:
+            rows = manager.list_subscribers(limit=3, cursor=cursor)
+            if not rows:
+                break
+            assert len(rows) <= 3
+            emails.extend(row['email'] for row in rows)
+            cursor = SubscriberManager.next_cursor(rows)
+        
+        assert emails == [f'user{i}@example.com' for i in reversed(range(7))]
+    
+    def test_pages_within_segment(self, manager):
+        """Test paging restricted to one segment"""
+        for i in range(4):
+            manager.add_subscriber(f'user{i}@example.com', f'User {i}',
+                                   segment='vip' if i % 2 else 'general')
+        
+        first = manager.list_subscribers(limit=1, segment='vip')
+        rest = manager.list_subscribers(limit=10, segment='vip',
+                                        cursor=SubscriberManager.next_cursor(first))
+        
+        assert [row['email'] for row in first + rest] == ['user3@example.com', 'user1@example.com']
+    
+    def test_cursor_is_keyword_only(self, manager):
+        """Test that a positional cursor is rejected"""
+        with pytest.raises(TypeError):
+            manager.list_subscribers(100, ('2024-01-01 00:00:00', 1))
+    
+    def test_next_cursor_of_empty_page(self):
+        """Test that an empty page has no next cursor"""
+        assert SubscriberManager.next_cursor([]) is None
+
+class TestEngagementScoresBulk:
+    """Test update_engagement_scores_bulk"""
+    
+    def test_updates_scores(self, manager):
+        """Test bulk score update of existing subscribers"""
+        manager.add_subscriber('a@example.com', 'A')
+        manager.add_subscriber('b@example.com', 'B')
+        
+        updated = manager.update_engagement_scores_bulk(
+            ['a@example.com', 'b@example.com', 'missing@example.com'], [12.5, 80, 50.0]
+        )
+        
+        assert updated == 2
+        assert manager.get_subscriber('a@example.com')['engagement_score'] == 12.5
+        assert manager.get_subscriber('b@example.com')['engagement_score'] == 80.0
+        assert manager.get_subscriber('a@example.com')['last_engaged'] is not None
+    
+    def test_length_mismatch_raises(self, manager):
+        """Test that mismatched emails and scores are rejected"""
+        with pytest.raises(ValueError):
+            manager.update_engagement_scores_bulk(['a@example.com'], [1.0, 2.0])
@@ -5,6 +5,8 @@ import os
 from typing import Dict, List, Tuple
 import re
 
+_DMARC_POLICY_RE = re.compile(r'p=(\w+)')
+
 class DNSChecker:
     def __init__(self, config_file: str = "config/domain_setup.json"):
         self.config_file = config_file
@@ -102,7 +104,7 @@ class DNSChecker:
                 txt_record = str(answer).strip('"')
                 if txt_record.startswith('v=DMARC1'):
                     # Check DMARC policy
-                    policy_match = re.search(r'p=(\w+)', txt_record)
+                    policy_match = _DMARC_POLICY_RE.search(txt_record)
                     if policy_match:
                         policy = policy_match.group(1)
                         if policy in ['quarantine', 'reject']: